@@ -257,10 +257,14 @@ class SQLiteDatabase {
     }
     stmt.free();
 
-    if (filters.status) {
-      return result.filter(f => f.status === filters.status);
-    }
-    return result;
+    // Dates are compared on their 'YYYY-MM-DD' prefix, bounds included
+    const day = d => (d || '').toString().slice(0, 10);
+    return result.filter(f => {
+      if (filters.status && f.status !== filters.status) return false;
+      if (filters.dateDebut && day(f.date_facture) < day(filters.dateDebut)) return false;
+      if (filters.dateFin && day(f.date_facture) > day(filters.dateFin)) return false;
+      return true;
+    });
   }
 
   getFactureById(id) {
@@ -0,0 +1,39 @@
+const request = require('supertest');
+const { setupDummyProfile, cleanupDummyProfile } = require('./testUtils');
+let app;
+const API_TOKEN = 'test-token'; // Standard test token
+
+beforeAll(async () => {
+  await setupDummyProfile();
+  app = await require('../server');
+});
+
+afterAll(async () => {
+  await cleanupDummyProfile();
+});
+
+describe('GET /api/factures?dateDebut=&dateFin=', () => {
+  test('returns only invoices within the date range, bounds included', async () => {
+    for (const date_facture of ['2023-05-31', '2023-06-01', '2023-06-30', '2023-07-01']) {
+      const createRes = await request(app)
+        .post('/api/factures')
+        .set('Authorization', `Bearer ${API_TOKEN}`)
+        .send({
+          nom_client: `Test Client Date Filter ${date_facture}`,
+          date_facture,
+          lignes: [{ description: 'Item Date', quantite: 1, prix_unitaire: 10 }],
+        });
+      expect(createRes.status).toBe(201);
+    }
+
+    const res = await request(app)
+      .get('/api/factures?dateDebut=2023-06-01&dateFin=2023-06-30&limit=100')
+      .set('Authorization', `Bearer ${API_TOKEN}`);
+    expect(res.status).toBe(200);
+    const dates = res.body.factures.map(f => f.date_facture.slice(0, 10));
+    expect(dates).toEqual(expect.arrayContaining(['2023-06-01', '2023-06-30']));
+    for (const date of dates) {
+      expect(date >= '2023-06-01' && date <= '2023-06-30').toBe(true);
+    }
+  });
+});
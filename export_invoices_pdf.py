@@ -0,0 +1,281 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from playwright.async_api import async_playwright, BrowserContext, Page, Route
+
+# --- Configuration ---
+API_BASE_URL = os.environ.get("API_BASE_URL", "http://localhost:3001")
+API_TOKEN = os.environ.get("API_TOKEN")  # Optional, sent as "Authorization: Bearer <token>"
+OUTPUT_DIR = "exports_pdf"
+PROGRESS_FILE = ".export_progress.jsonl"  # Written inside OUTPUT_DIR, one JSON line per invoice
+POOL_SIZE = 4  # Number of warm pages rendering in parallel
+LIST_PAGE_SIZE = 100  # Max accepted by GET /api/factures
+RENDER_TIMEOUT_MS = 30000
+PROGRESS_EVERY = 25  # Log throughput every N rendered invoices
+# Static resources shared by every invoice (logo, CSS, fonts) are fetched once and replayed from memory
+CACHED_RESOURCE_TYPES = {"stylesheet", "font", "image"}
+
+# --- Logging Setup ---
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+
+def api_headers():
+    return {"Authorization": f"Bearer {API_TOKEN}"} if API_TOKEN else {}
+
+
+def load_progress(progress_path):
+    """Returns the set of invoice IDs already exported by a previous run."""
+    done = set()
+    if not os.path.exists(progress_path):
+        return done
+    with open(progress_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Truncated last line if the previous run was killed mid-write
+            if entry.get("status") == "done":
+                done.add(str(entry["id"]))
+    return done
+
+
+async def stream_invoice_ids(context: BrowserContext, filters):
+    """Yields invoice IDs page by page from GET /api/factures, oldest first."""
+    page_num = 1
+    while True:
+        params = {**filters, "page": page_num, "limit": LIST_PAGE_SIZE, "sortBy": "date", "order": "asc"}
+        response = await context.request.get(f"{API_BASE_URL}/api/factures", params=params, headers=api_headers())
+        if not response.ok:
+            raise RuntimeError(f"GET /api/factures page {page_num} failed: HTTP {response.status}")
+        payload = await response.json()
+        for facture in payload.get("factures", []):
+            yield str(facture["id"])
+        if page_num >= payload.get("pagination", {}).get("totalPages", 0):
+            return
+        page_num += 1
+
+
+class SharedAssetCache:
+    """Serves static assets from memory so each pooled page does not re-download them."""
+
+    def __init__(self):
+        self.responses = {}
+        self.locks = {}
+
+    async def handle(self, route: Route):
+        request = route.request
+        if request.resource_type not in CACHED_RESOURCE_TYPES:
+            await route.fallback()
+            return
+        url = request.url
+        lock = self.locks.setdefault(url, asyncio.Lock())
+        async with lock:  # Only the first page to ask for an asset hits the network
+            if url not in self.responses:
+                try:
+                    response = await route.fetch()
+                    if not response.ok:
+                        # Pass a 404/5xx through once without caching it: the next page retries the asset
+                        logging.warning(f"Asset {url} returned HTTP {response.status}")
+                        await route.fulfill(response=response)
+                        return
+                    self.responses[url] = (response.status, response.headers, await response.body())
+                except Exception as e:
+                    # An unanswered route would stall the page until RENDER_TIMEOUT_MS; the next page retries
+                    logging.warning(f"Could not fetch asset {url}: {e}")
+                    await route.abort()
+                    return
+        status, headers, body = self.responses[url]
+        await route.fulfill(status=status, headers=headers, body=body)
+
+
+async def handle_invoice_html(route: Route):
+    # /api/factures/:id/html is served as an attachment, which would turn page.goto() into a download.
+    try:
+        response = await route.fetch(headers={**route.request.headers, **api_headers()})
+    except Exception as e:
+        # Backend refused or dropped the connection: fail this invoice now, not after RENDER_TIMEOUT_MS
+        logging.warning(f"Could not fetch {route.request.url}: {e}")
+        await route.abort()
+        return
+    headers = {k: v for k, v in response.headers.items() if k.lower() != "content-disposition"}
+    await route.fulfill(response=response, headers=headers)
+
+
+def is_crash_error(error):
+    message = str(error)
+    return "Target crashed" in message or "Page crashed" in message
+
+
+class PooledPage:
+    """One page of the pool, replaced by a fresh one when its renderer crashes."""
+
+    def __init__(self, context: BrowserContext):
+        self.context = context
+        self.page = None
+        self.crashed = False
+
+    async def open(self):
+        self.page = await self.context.new_page()
+        self.crashed = False
+        # A crashed page only emits "crash": is_closed() stays False and every later goto fails at once
+        self.page.on("crash", self._on_crash)
+        return self
+
+    def _on_crash(self, _page):
+        self.crashed = True
+
+    async def recover(self, error):
+        """Replaces the page if `error` (or a "crash" event) shows it is dead. Returns True if replaced."""
+        if not (self.crashed or is_crash_error(error)):
+            return False
+        try:
+            await self.page.close()
+        except Exception:
+            pass  # Already gone with its renderer
+        await self.open()
+        return True
+
+
+async def render_invoice(page: Page, invoice_id, output_dir):
+    final_path = os.path.join(output_dir, f"facture-{invoice_id}.pdf")
+    tmp_path = final_path + ".part"
+    response = await page.goto(f"{API_BASE_URL}/api/factures/{invoice_id}/html", wait_until="load", timeout=RENDER_TIMEOUT_MS)
+    if response is None or not response.ok:
+        # 404 / errorHandler JSON must not end up printed into a PDF and marked as done
+        status = response.status if response else "no response"
+        raise RuntimeError(f"GET /api/factures/{invoice_id}/html failed: HTTP {status}")
+    try:
+        await page.pdf(path=tmp_path, format="A4", print_background=True, prefer_css_page_size=True)
+        os.replace(tmp_path, final_path)  # A PDF on disk is always complete, even after a crash
+    finally:
+        if os.path.exists(tmp_path):  # Only left behind when pdf() or replace() failed
+            os.remove(tmp_path)
+    return final_path
+
+
+async def export_batch(filters, output_dir, pool_size, restart):
+    os.makedirs(output_dir, exist_ok=True)
+    progress_path = os.path.join(output_dir, PROGRESS_FILE)
+    if restart and os.path.exists(progress_path):
+        os.remove(progress_path)
+    already_done = load_progress(progress_path)
+    if already_done:
+        logging.info(f"Resuming: {len(already_done)} invoice(s) already exported, skipping them")
+
+    stats = {"done": 0, "failed": 0, "skipped": 0}
+    failures = []
+    errors = []  # Problems that stopped the run early, as opposed to single failed invoices
+    # Bounded so listing never runs far ahead of rendering
+    queue = asyncio.Queue(maxsize=pool_size * 2)
+    started = time.monotonic()
+
+    def log_throughput(final=False):
+        elapsed = time.monotonic() - started
+        rate = stats["done"] / elapsed if elapsed > 0 else 0.0
+        prefix = "Finished" if final else "Progress"
+        logging.info(
+            f"{prefix}: {stats['done']} exported, {stats['failed']} failed, {stats['skipped']} skipped "
+            f"in {elapsed:.1f}s ({rate:.2f} invoices/s)"
+        )
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        context = await browser.new_context()
+        cache = SharedAssetCache()
+        await context.route("**/api/factures/*/html", handle_invoice_html)
+        await context.route("**/*", cache.handle)  # Registered last, so it is matched first for assets
+
+        pool = [await PooledPage(context).open() for _ in range(pool_size)]
+
+        with open(progress_path, "a", encoding="utf-8") as progress:
+
+            def record(invoice_id, status, error=None):
+                entry = {"id": invoice_id, "status": status}
+                if error:
+                    entry["error"] = error
+                progress.write(json.dumps(entry) + "\n")
+                progress.flush()
+
+            async def producer():
+                try:
+                    async for invoice_id in stream_invoice_ids(context, filters):
+                        if invoice_id in already_done:
+                            stats["skipped"] += 1
+                            continue
+                        await queue.put(invoice_id)
+                except Exception as e:  # Listing failed: let the workers finish what is already queued
+                    errors.append(f"Listing invoices stopped early: {e}")
+                # Not reached on cancellation, when no worker is left to take the stop signals
+                for _ in pool:
+                    await queue.put(None)  # One stop signal per worker
+
+            async def worker(pooled: PooledPage):
+                while True:
+                    invoice_id = await queue.get()
+                    if invoice_id is None:
+                        return
+                    try:
+                        await render_invoice(pooled.page, invoice_id, output_dir)
+                    except Exception as e:
+                        if await pooled.recover(e):
+                            logging.warning(f"Page crashed while rendering invoice {invoice_id}, replaced it")
+                        stats["failed"] += 1
+                        failures.append((invoice_id, str(e)))
+                        record(invoice_id, "failed", str(e))
+                        logging.error(f"Invoice {invoice_id} failed: {e}")
+                        continue
+                    stats["done"] += 1
+                    record(invoice_id, "done")
+                    if stats["done"] % PROGRESS_EVERY == 0:
+                        log_throughput()
+
+            producer_task = asyncio.create_task(producer())
+            worker_tasks = [asyncio.create_task(worker(pooled)) for pooled in pool]
+            try:
+                await asyncio.gather(*worker_tasks)
+            except Exception as e:
+                # A worker died outside the per-invoice handling (page replacement, progress file I/O...):
+                # stop everything rather than leave the producer blocked on a queue nobody drains.
+                errors.append(f"Export aborted: {e}")
+                for task in (producer_task, *worker_tasks):
+                    task.cancel()
+                await asyncio.gather(producer_task, *worker_tasks, return_exceptions=True)
+            else:
+                await producer_task
+
+        await browser.close()
+
+    log_throughput(final=True)
+    for error in errors:
+        logging.error(f"{error}. Re-run to resume.")
+    for invoice_id, error in failures:
+        logging.error(f"- {invoice_id}: {error}")
+    if failures:
+        logging.error("Re-run the same command to retry failed invoices.")
+    return not failures and not errors
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Export invoices to PDF in batch from the running backend.")
+    parser.add_argument("--from", dest="date_debut", default="", help="Start date (YYYY-MM-DD), forwarded as dateDebut")
+    parser.add_argument("--to", dest="date_fin", default="", help="End date (YYYY-MM-DD), forwarded as dateFin")
+    parser.add_argument("--status", default="", choices=["", "paid", "unpaid"], help="Only export invoices with this status")
+    parser.add_argument("--output", default=OUTPUT_DIR, help=f"Output directory (default: {OUTPUT_DIR})")
+    parser.add_argument("--pool-size", type=int, default=POOL_SIZE, help=f"Pages rendering in parallel (default: {POOL_SIZE})")
+    parser.add_argument("--restart", action="store_true", help="Ignore previous progress and export everything again")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    filters = {k: v for k, v in {"dateDebut": args.date_debut, "dateFin": args.date_fin, "status": args.status}.items() if v}
+    if asyncio.run(export_batch(filters, args.output, max(args.pool_size, 1), args.restart)):
+        print("Export COMPLETED")
+    else:
+        print("Export INCOMPLETE")
@@ -0,0 +1,77 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("playwright.async_api")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from export_invoices_pdf import PooledPage  # noqa: E402
+
+
+class StubPage:
+    def __init__(self):
+        self.handlers = {}
+        self.closed = False
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def crash(self):
+        self.handlers["crash"](self)
+
+    async def close(self):
+        self.closed = True
+
+
+class StubContext:
+    def __init__(self):
+        self.pages = []
+
+    async def new_page(self):
+        page = StubPage()
+        self.pages.append(page)
+        return page
+
+
+def test_crash_event_replaces_page():
+    async def scenario():
+        context = StubContext()
+        pooled = await PooledPage(context).open()
+        crashed_page = pooled.page
+        crashed_page.crash()
+
+        assert await pooled.recover(RuntimeError("net::ERR_ABORTED")) is True
+        assert crashed_page.closed
+        assert pooled.page is not crashed_page
+        assert not pooled.crashed
+        assert len(context.pages) == 2
+
+    asyncio.run(scenario())
+
+
+def test_crash_error_replaces_page_without_event():
+    async def scenario():
+        context = StubContext()
+        pooled = await PooledPage(context).open()
+        crashed_page = pooled.page
+
+        assert await pooled.recover(RuntimeError("Page.goto: Target crashed")) is True
+        assert crashed_page.closed
+        assert pooled.page is not crashed_page
+
+    asyncio.run(scenario())
+
+
+def test_ordinary_failure_keeps_page():
+    async def scenario():
+        context = StubContext()
+        pooled = await PooledPage(context).open()
+        page = pooled.page
+
+        assert await pooled.recover(RuntimeError("HTTP 404")) is False
+        assert pooled.page is page
+        assert not page.closed
+
+    asyncio.run(scenario())
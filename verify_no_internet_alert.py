@@ -1,60 +1,148 @@
 import asyncio
-from playwright.async_api import async_playwright, Dialog
+import os
+import time
+from urllib.parse import urlparse
+from playwright.async_api import async_playwright, Browser, Dialog, Route
 
-APP_URL = "http://localhost:5174" # Updated port
+APP_URL = os.environ.get("APP_URL", "http://localhost:5174")
+APP_ORIGIN = "{0.scheme}://{0.netloc}".format(urlparse(APP_URL))
 PAGES_TO_CHECK = ["/", "/factures", "/clients"]
-CONSOLE_ERRORS = []
-DIALOG_DETECTED = False
+SETTLE_MS = 1000  # Allow for any async UI updates (and the app's reaction to going offline)
 
-def handle_dialog(dialog: Dialog):
-    global DIALOG_DETECTED
-    DIALOG_DETECTED = True
-    print(f"UNEXPECTED DIALOG DETECTED: type={dialog.type}, message='{dialog.message}'")
-    asyncio.create_task(dialog.dismiss()) # Dismiss it anyway
+# Each route is checked under every profile, all in parallel and in isolated browser contexts.
+# - "offline" starts the app with no internet but the dev server still reachable: every request
+#   outside APP_ORIGIN is aborted and navigator.onLine reports false from the first script, which is
+#   what checkInternetConnection() in frontend/src/main.tsx sees when it runs at startup. After load,
+#   context.set_offline(True) also cuts the dev server to cover the runtime "offline" event.
+#   Console errors caused by that simulation (blocked external requests, anything logged once the
+#   network is cut) are reported but do not fail the check; other errors during load still do.
+# - "throttled" uses Chromium's CDP network emulation (roughly "Slow 3G"). The dev server's unbundled
+#   module graph keeps requests trickling in for a long time at that speed, so it waits for "load"
+#   rather than "networkidle", with a budget sized for the throttled bandwidth.
+NETWORK_PROFILES = {
+    "online": {"timeout_ms": 10000, "wait_until": "networkidle"},
+    "offline": {"timeout_ms": 10000, "wait_until": "networkidle", "no_internet": True, "go_offline": True},
+    "throttled": {
+        "timeout_ms": 90000,
+        "wait_until": "load",
+        "conditions": {
+            "offline": False,
+            "latency": 400,  # ms
+            "downloadThroughput": 500 * 1024 / 8,  # bytes/s
+            "uploadThroughput": 500 * 1024 / 8,
+        },
+    },
+}
 
-def handle_console_error(msg):
-    if msg.type.lower() == 'error':
-        print(f"CONSOLE ERROR: {msg.text}")
-        CONSOLE_ERRORS.append(msg.text)
 
-async def main():
-    global DIALOG_DETECTED
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
+async def check_route(browser: Browser, path, profile_name, profile):
+    """Loads one route under one network profile and collects its dialogs and console errors."""
+    url_to_visit = APP_URL + path
+    label = f"[{profile_name}] {path}"
+    result = {
+        "path": path,
+        "profile": profile_name,
+        "dialogs": [],
+        "console_errors": [],
+        "console_errors_offline": [],  # Expected under the offline simulation, informational only
+        "error": None,
+    }
+    blocked_urls = set()
+    network_cut = False
+
+    def handle_dialog(dialog: Dialog):
+        result["dialogs"].append(f"type={dialog.type}, message='{dialog.message}'")
+        print(f"{label} UNEXPECTED DIALOG DETECTED: type={dialog.type}, message='{dialog.message}'")
+        asyncio.create_task(dialog.dismiss())  # Dismiss it anyway
 
-        # Listen for unexpected dialogs
+    def handle_console_error(msg):
+        if msg.type.lower() == 'error':
+            print(f"{label} CONSOLE ERROR: {msg.text}")
+            if network_cut or msg.location.get("url") in blocked_urls:
+                result["console_errors_offline"].append(msg.text)
+            else:
+                result["console_errors"].append(msg.text)
+
+    async def block_internet(route: Route):
+        url = route.request.url
+        if url.startswith(APP_ORIGIN + "/") or url == APP_ORIGIN:
+            await route.fallback()
+            return
+        blocked_urls.add(url)
+        await route.abort("internetdisconnected")
+
+    context = await browser.new_context()
+    started = time.monotonic()
+    try:
+        if profile.get("no_internet"):
+            await context.route("**/*", block_internet)
+            await context.add_init_script(
+                "Object.defineProperty(Navigator.prototype, 'onLine', { get: () => false, configurable: true });"
+            )
+
+        page = await context.new_page()
         page.on("dialog", handle_dialog)
-        # Listen for console errors
         page.on("console", handle_console_error)
 
-        for path in PAGES_TO_CHECK:
-            DIALOG_DETECTED = False # Reset for each page
-            url_to_visit = APP_URL + path
-            print(f"Navigating to {url_to_visit}...")
-            try:
-                await page.goto(url_to_visit, wait_until="networkidle", timeout=10000)
-                await page.wait_for_timeout(1000) # Allow for any async UI updates
-
-                if DIALOG_DETECTED:
-                    print(f"FAIL: Internet alert dialog was detected on {url_to_visit}")
-                    # No need to proceed further if this fails
-                    await browser.close()
-                    return False
-                else:
-                    print(f"SUCCESS: No internet alert dialog detected on {url_to_visit}")
-
-            except Exception as e:
-                print(f"Error during navigation or check on {url_to_visit}: {e}")
-                await browser.close()
-                return False
+        if "conditions" in profile:
+            cdp = await context.new_cdp_session(page)
+            await cdp.send("Network.enable")
+            await cdp.send("Network.emulateNetworkConditions", profile["conditions"])
+
+        print(f"{label} Navigating to {url_to_visit}...")
+        await page.goto(url_to_visit, wait_until=profile["wait_until"], timeout=profile["timeout_ms"])
+        if profile.get("go_offline"):
+            network_cut = True
+            await context.set_offline(True)
+        await page.wait_for_timeout(SETTLE_MS)
+    except Exception as e:
+        result["error"] = str(e)
+        print(f"{label} Error during navigation or check on {url_to_visit}: {e}")
+    finally:
+        await context.close()
+    result["duration_s"] = time.monotonic() - started
+    return result
 
+
+def is_failure(result):
+    return bool(result["error"] or result["dialogs"] or result["console_errors"])
+
+
+async def main():
+    started = time.monotonic()
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        results = await asyncio.gather(*(
+            check_route(browser, path, profile_name, profile)
+            for profile_name, profile in NETWORK_PROFILES.items()
+            for path in PAGES_TO_CHECK
+        ))
         await browser.close()
+    elapsed = time.monotonic() - started
+
+    print("\nResults:")
+    for result in results:
+        status = "FAIL" if is_failure(result) else "SUCCESS"
+        print(
+            f"{status}: [{result['profile']}] {result['path']} "
+            f"({result['duration_s']:.1f}s, {len(result['dialogs'])} dialog(s), "
+            f"{len(result['console_errors'])} console error(s), "
+            f"{len(result['console_errors_offline'])} expected while offline)"
+        )
+        if result["error"]:
+            print(f"  - navigation error: {result['error']}")
+        for dialog in result["dialogs"]:
+            print(f"  - dialog: {dialog}")
+        for err in result["console_errors"]:
+            print(f"  - console: {err}")
+        for err in result["console_errors_offline"]:
+            print(f"  - console (offline, informational): {err}")
+
+    slowest = max(result["duration_s"] for result in results)
+    print(f"\nChecked {len(results)} route/profile combinations in {elapsed:.1f}s (slowest single page: {slowest:.1f}s)")
 
-    if CONSOLE_ERRORS:
-        print(f"FAIL: Console errors detected during navigation.")
-        for err in CONSOLE_ERRORS:
-            print(f"- {err}")
+    if any(is_failure(result) for result in results):
+        print("FAIL: Unexpected dialogs, navigation errors or console errors detected.")
         return False
 
     print("SUCCESS: All checks passed. No unexpected dialogs and no console errors.")